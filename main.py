@@ -8,6 +8,7 @@ import sys
 import random
 import math
 import heapq
+import numpy as np
 import pygame
 from pygame.math import Vector2
 
@@ -88,6 +89,7 @@ ENEMY_SHEET_LAYOUT = [
 ]
 
 FRAME_DURATION = {'idle': 220, 'run': 100, 'transition': 140}
+ANIM_SPEED_BUCKETS = 16      # Speed steps for precomputed speed-scaled frame durations
 SCREEN_SIZE = (800, 600)
 WORLD_SIZE = (2000, 2000)
 FPS = 60
@@ -104,9 +106,12 @@ ENEMY_ACCELERATION = 900.0
 NAV_CELL_SIZE = 48
 NAV_EXPAND_CELLS = 1
 PATH_RECALC_INTERVAL = 0.85
+PATH_RECALC_JITTER = 0.15  # +/- fraction of the interval, so enemies' repaths drift apart
 PLAYER_MOVE_REPATH_DIST = 64
 SEPARATION_RADIUS = 36.0
 SEPARATION_FORCE = 420.0
+ENEMY_AVOID_FORCE = 600.0
+ENEMY_AVOID_RADIUS = max(NAV_CELL_SIZE * 0.8, 32)
 PLAYER_MAX_HEARTS = 5
 HIT_FLASH_MS = 200
 SPRINT_MULTIPLIER = 1.60
@@ -128,6 +133,10 @@ SKY_COLORS = {
     'sunset': (255, 120, 60),       # Orange sunset
     'night': (40, 60, 120)          # Blue night
 }
+SKY_LUT_SIZE = 1024          # Precomputed sky colors per day/night cycle (power of two)
+SKY_GRADIENT_HEIGHT = 60     # Height of the sky fade at the top of the screen
+GRADIENT_CACHE_SIZE = 32     # Sky fades kept around; colors drift slowly so recent ones get reused
+PATH_CACHE_SIZE = 512        # Recent (start, goal) grid paths kept per nav grid
 SFX_VOLUME = {
     'walking': 0.3,      # Walking footsteps
     'running': 0.4,      # Running footsteps
@@ -165,10 +174,12 @@ SHAKE_ON_HIT = True            # Shake when player is hit
 SHAKE_ON_OBSTACLE = True       # Shake when hitting obstacles
 GROUND_TILE_SIZE = 256          # Size of each ground texture tile (pixels)
 GROUND_TINT_COLOR = None        # (R, G, B) to tint the ground, None = no tint
+GROUND_MACRO_TILES = 4          # Ground tiles baked per side of each macro-tile
 ENEMY_DESPAWN_MS = 700  
 PLAYER_PAUSE_ON_CATCH_MS = 800
 
 PLACEMENT_ATTEMPTS_MULT = 30
+OBSTACLE_GRID_CELL = 64         # Spatial hash cell size for obstacle lookups (pixels)
 
 
 def slice_row(sheet, row_index, frame_w, frame_h, frames_count=None):
@@ -177,19 +188,23 @@ def slice_row(sheet, row_index, frame_w, frame_h, frames_count=None):
     max_cols = sheet_w // frame_w
     if frames_count is None:
         frames_count = max_cols
-    frames = []
     y = row_index * frame_h
-    for i in range(frames_count):
-        x = i * frame_w
-        if x + frame_w <= sheet_w and y + frame_h <= sheet_h:
-            frame = sheet.subsurface(pygame.Rect(x, y, frame_w, frame_h)).copy()
-            frames.append(frame)
-    return frames
+    if y + frame_h > sheet_h:
+        return []
+    # Clamp once instead of bounds-checking every frame. Frames are never drawn
+    # into, so views that share the sheet's pixels are enough (no copies)
+    subsurface = sheet.subsurface
+    return [subsurface((i * frame_w, y, frame_w, frame_h)) for i in range(min(frames_count, max_cols))]
+
+def scale_frames(frames, scale):
+    if scale == 1.0:
+        return frames
+    return [pygame.transform.scale(f, (int(f.get_width()*scale), int(f.get_height()*scale))) for f in frames]
 
 def build_animations_from_master(path, frame_w, frame_h, layout, scale=1.0):
     # If the sprite sheet file doesn't exist, create placeholder animations
     if not os.path.isfile(path):
-        fallback = pygame.Surface((frame_w, frame_h), pygame.SRCALPHA)
+        fallback = pygame.Surface((frame_w, frame_h), pygame.SRCALPHA).convert_alpha()
         fallback.fill((200, 100, 100, 255))
         anims = {}
         for st in ['idle', 'run', 'transition']:
@@ -209,36 +224,88 @@ def build_animations_from_master(path, frame_w, frame_h, layout, scale=1.0):
         facing = entry['facing']
         frames_count = entry.get('frames', None)
         
-        frames = slice_row(sheet, row, frame_w, frame_h, frames_count)
-        
-        if scale != 1.0:
-            frames = [pygame.transform.scale(f, (int(f.get_width()*scale), int(f.get_height()*scale))) for f in frames]
+        frames = scale_frames(slice_row(sheet, row, frame_w, frame_h, frames_count), scale)
         
         if state not in anims:
             anims[state] = {}
         anims[state][facing] = frames
     
+    placeholder = None
     for st in ['idle', 'run', 'transition']:
         if st not in anims:
             anims[st] = {}
         for dirn in ['down', 'left', 'right', 'up']:
             if dirn not in anims[st] or len(anims[st][dirn]) == 0:
-                # Create a gray placeholder frame
-                s = pygame.Surface((frame_w, frame_h), pygame.SRCALPHA)
-                s.fill((150, 150, 150))
-                anims[st][dirn] = [s]
+                # All missing entries share one gray placeholder frame
+                if placeholder is None:
+                    placeholder = pygame.Surface((frame_w, frame_h), pygame.SRCALPHA).convert_alpha()
+                    placeholder.fill((150, 150, 150))
+                anims[st][dirn] = [placeholder]
     
     return anims
 
-def facing_from_vector(vec):
+_mask_cache = {}
+
+def mask_for(surface):
+    """Returns the collision mask for a frame, building it only the first time"""
+    mask = _mask_cache.get(surface)
+    if mask is None:
+        mask = pygame.mask.from_surface(surface)
+        _mask_cache[surface] = mask
+    return mask
+
+_frame_masks_cache = {}
+
+def frame_masks(frames):
+    """Masks parallel to an animation's frame list, built once per list"""
+    entry = _frame_masks_cache.get(id(frames))
+    if entry is None or entry[0] is not frames:
+        # Keep the list itself in the entry so its id can't be reused by another list
+        entry = _frame_masks_cache[id(frames)] = (frames, [mask_for(f) for f in frames])
+    return entry[1]
+
+_tint_cache = {}
+
+def tinted(surface, rgba):
+    """Returns a copy of surface with rgba added to every pixel, built once per (surface, rgba)"""
+    key = (surface, rgba)
+    img = _tint_cache.get(key)
+    if img is None:
+        img = surface.copy()
+        img.fill(rgba, special_flags=pygame.BLEND_RGBA_ADD)
+        _tint_cache[key] = img
+    return img
+
+_bounds_cache = {}
+
+def opaque_bounds(surface):
+    """Rect around the frame's set mask bits, relative to its top-left; masks can only overlap inside it"""
+    bounds = _bounds_cache.get(surface)
+    if bounds is None:
+        rects = mask_for(surface).get_bounding_rects()
+        bounds = rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+        _bounds_cache[surface] = bounds
+    return bounds
+
+def warm_masks(anims):
+    """Builds masks and their bounds for every frame up front so animation ticks never scan pixels"""
+    for dirs in anims.values():
+        for frames in dirs.values():
+            for frame in frames:
+                opaque_bounds(frame)
+
+# Indexed by (horizontal << 2) | ((vx > 0) << 1) | (vy >= 0); a zero vector lands on 'down'
+_FACING_LUT = ('up', 'down', 'up', 'down', 'left', 'left', 'right', 'right')
 
-    if vec.length_squared() == 0:
-        return 'down'
+def facing_from_vector(vec):
     vx, vy = vec.x, vec.y
-    if abs(vx) > abs(vy):
-        return 'right' if vx > 0 else 'left'
-    else:
-        return 'down' if vy > 0 else 'up'
+    return _FACING_LUT[((vx * vx > vy * vy) << 2) | ((vx > 0) << 1) | (vy >= 0)]
+
+def speed_duration_table(base, slow_scale, fast_scale, floor):
+    """Frame durations for ANIM_SPEED_BUCKETS speed ratios from 0 to 1"""
+    last = ANIM_SPEED_BUCKETS - 1
+    return [max(floor, int(base * (slow_scale - (slow_scale - fast_scale) * i / last)))
+            for i in range(ANIM_SPEED_BUCKETS)]
 
 def lerp_color(c1, c2, t):
 
@@ -247,7 +314,7 @@ def lerp_color(c1, c2, t):
     b = int(c1[2] + (c2[2] - c1[2]) * t)
     return (r, g, b)
 
-def get_sky_color(cycle_time, day_len, night_len):
+def _compute_sky_color(cycle_time, day_len, night_len):
 
     cycle_total = day_len + night_len
     t = cycle_time % cycle_total
@@ -275,6 +342,100 @@ def get_sky_color(cycle_time, day_len, night_len):
             blend = (night_progress - 0.8) / 0.2
             return lerp_color(SKY_COLORS['night'], SKY_COLORS['sunrise'], blend)
 
+_sky_luts = {}
+
+def get_sky_color(cycle_time, day_len, night_len):
+    """Looks up the sky color from a table built once per cycle length"""
+    entry = _sky_luts.get((day_len, night_len))
+    if entry is None:
+        cycle_total = day_len + night_len
+        step = cycle_total / SKY_LUT_SIZE
+        lut = [_compute_sky_color(i * step, day_len, night_len) for i in range(SKY_LUT_SIZE)]
+        # Keep the cycle length and seconds-to-index scale with the table
+        entry = _sky_luts[(day_len, night_len)] = (lut, cycle_total, SKY_LUT_SIZE / cycle_total)
+    lut, cycle_total, index_scale = entry
+    return lut[int((cycle_time % cycle_total) * index_scale) & (SKY_LUT_SIZE - 1)]
+
+_gradient_cache = {}
+
+def get_sky_gradient(sky_color, width, height=SKY_GRADIENT_HEIGHT):
+    """Returns the top-of-screen sky fade, built once per exact color (the sky LUT limits how many there are)"""
+    key = (tuple(sky_color), width, height)
+    surf = _gradient_cache.get(key)
+    if surf is None:
+        if len(_gradient_cache) >= GRADIENT_CACHE_SIZE:
+            del _gradient_cache[next(iter(_gradient_cache))]  # Oldest first
+        # One column with the alpha ramp written in a single NumPy pass, then stretched across
+        column = pygame.Surface((1, height), pygame.SRCALPHA)
+        column.fill(sky_color)
+        alpha = pygame.surfarray.pixels_alpha(column)
+        alpha[0, :] = (255 * (1 - np.arange(height) / height) * 0.7).astype(np.uint8)  # Fade out towards bottom
+        del alpha  # Unlock the surface before scaling
+        surf = pygame.transform.scale(column, (width, height)).convert_alpha()
+        _gradient_cache[key] = surf
+    return surf
+
+_overlay_cache = {}
+
+def get_overlay(size, rgba):
+    """Returns a full-size translucent fill, created once per (size, rgba)"""
+    key = (size, rgba)
+    surf = _overlay_cache.get(key)
+    if surf is None:
+        surf = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        surf.fill(rgba)
+        _overlay_cache[key] = surf
+    return surf
+
+_heart_row_cache = {}
+
+def get_heart_row(heart_img, count, gap=4):
+    """Returns count hearts laid out in a row, composited once per (image, count)"""
+    key = (heart_img, count)
+    row = _heart_row_cache.get(key)
+    if row is None:
+        step = heart_img.get_width() + gap
+        row = pygame.Surface((max(1, count * step), heart_img.get_height()), pygame.SRCALPHA).convert_alpha()
+        for i in range(count):
+            row.blit(heart_img, (i * step, 0))
+        _heart_row_cache[key] = row
+    return row
+
+_stamina_bar_cache = {}
+
+def get_stamina_bar(bar_w, bar_h, inner_w):
+    """Returns the stamina bar drawn for one fill width, built once per width"""
+    key = (bar_w, bar_h, inner_w)
+    bar = _stamina_bar_cache.get(key)
+    if bar is None:
+        bar = pygame.Surface((bar_w, bar_h)).convert()
+        bar.fill((40, 40, 40))
+        pygame.draw.rect(bar, (80, 200, 120), (2, 2, max(0, inner_w - 4), bar_h - 4))
+        _stamina_bar_cache[key] = bar
+    return bar
+
+_font_cache = {}
+
+def get_font(size, bold=False):
+    """Returns a default system font, loading each (size, bold) only once"""
+    key = (size, bold)
+    font = _font_cache.get(key)
+    if font is None:
+        font = pygame.font.SysFont(None, size, bold=bold)
+        _font_cache[key] = font
+    return font
+
+_text_cache = {}
+
+def cached_render(font, text, color):
+    """Renders static UI text once and reuses the surface afterwards"""
+    key = (font, text, color)
+    surf = _text_cache.get(key)
+    if surf is None:
+        surf = font.render(text, True, color)
+        _text_cache[key] = surf
+    return surf
+
 # ===================== CUTSCENE SYSTEM =====================
 
 class Cutscene:
@@ -289,10 +450,11 @@ class Cutscene:
         self.can_skip = False
         self.skip_delay = 500  # Can skip after 500ms
         self.start_time = pygame.time.get_ticks()
+        self._layout_cache = (None, [])  # (layout key, rendered line surfaces)
         
-    def update(self):
-
-        now = pygame.time.get_ticks()
+    def update(self, now_ms=None):
+        # The main loop passes its frame timestamp; other callers fall back to the clock
+        now = pygame.time.get_ticks() if now_ms is None else now_ms
         
         if now - self.start_time > self.skip_delay:
             self.can_skip = True
@@ -311,18 +473,11 @@ class Cutscene:
             self.char_index = len(self.full_text)
             self.finished = True
     
-    def draw(self, screen, screen_size):
-        """Draws the cutscene textbox"""
-        box_width = screen_size[0] - 100
-        box_height = 140
-        box_x = 50
-        box_y = screen_size[1] - box_height - 40
-        
-        box_surf = pygame.Surface((box_width, box_height), pygame.SRCALPHA)
-        box_surf.fill(CUTSCENE_BG_COLOR)
-        screen.blit(box_surf, (box_x, box_y))
-        
-        pygame.draw.rect(screen, CUTSCENE_BORDER_COLOR, (box_x, box_y, box_width, box_height), 4)
+    def _layout_lines(self, max_width):
+        """Word-wraps the displayed text, re-rendering only when it changes"""
+        key = (self.char_index, max_width)
+        if self._layout_cache[0] == key:
+            return self._layout_cache[1]
         
         words = self.displayed_text.split(' ')
         lines = []
@@ -330,8 +485,7 @@ class Cutscene:
         
         for word in words:
             test_line = current_line + word + " "
-            test_surf = self.font.render(test_line, True, CUTSCENE_TEXT_COLOR)
-            if test_surf.get_width() < box_width - 40:
+            if self.font.size(test_line)[0] < max_width:
                 current_line = test_line
             else:
                 if current_line:
@@ -340,31 +494,56 @@ class Cutscene:
         if current_line:
             lines.append(current_line)
         
+        surfs = [self.font.render(line, True, CUTSCENE_TEXT_COLOR) for line in lines]
+        self._layout_cache = (key, surfs)
+        return surfs
+    
+    def draw(self, screen, screen_size):
+        """Draws the cutscene textbox"""
+        box_width = screen_size[0] - 100
+        box_height = 140
+        box_x = 50
+        box_y = screen_size[1] - box_height - 40
+        
+        screen.blit(get_overlay((box_width, box_height), CUTSCENE_BG_COLOR), (box_x, box_y))
+        
+        pygame.draw.rect(screen, CUTSCENE_BORDER_COLOR, (box_x, box_y, box_width, box_height), 4)
+        
         text_y = box_y + 20
-        for line in lines:
-            text_surf = self.font.render(line, True, CUTSCENE_TEXT_COLOR)
+        for text_surf in self._layout_lines(box_width - 40):
             screen.blit(text_surf, (box_x + 20, text_y))
             text_y += 30
         
         if self.finished:
-            indicator_font = pygame.font.SysFont(None, 24)
-            indicator = indicator_font.render("Press SPACE to continue...", True, (200, 200, 100))
+            indicator_font = get_font(24)
+            indicator = cached_render(indicator_font, "Press SPACE to continue...", (200, 200, 100))
             screen.blit(indicator, (box_x + box_width - indicator.get_width() - 20, box_y + box_height - 35))
         elif self.can_skip:
-            skip_font = pygame.font.SysFont(None, 20)
-            skip_text = skip_font.render("Press SPACE to skip", True, (150, 150, 150))
+            skip_font = get_font(20)
+            skip_text = cached_render(skip_font, "Press SPACE to skip", (150, 150, 150))
             screen.blit(skip_text, (box_x + box_width - skip_text.get_width() - 20, box_y + box_height - 30))
 
-def draw_key_icon(screen, x, y, key_text, size=40):
-    """Draws a keyboard key icon"""
-    key_rect = pygame.Rect(x, y, size, size)
-    pygame.draw.rect(screen, (60, 60, 80), key_rect, border_radius=5)
-    pygame.draw.rect(screen, (100, 100, 120), key_rect, 3, border_radius=5)
+_key_icon_cache = {}
+
+def _build_key_icon(key_text, size):
+    icon = pygame.Surface((size, size), pygame.SRCALPHA).convert_alpha()
+    key_rect = icon.get_rect()
+    pygame.draw.rect(icon, (60, 60, 80), key_rect, border_radius=5)
+    pygame.draw.rect(icon, (100, 100, 120), key_rect, 3, border_radius=5)
     
-    key_font = pygame.font.SysFont(None, 28, bold=True)
+    key_font = get_font(28, bold=True)
     text_surf = key_font.render(key_text, True, (220, 220, 240))
     text_rect = text_surf.get_rect(center=key_rect.center)
-    screen.blit(text_surf, text_rect)
+    icon.blit(text_surf, text_rect)
+    return icon
+
+def draw_key_icon(screen, x, y, key_text, size=40):
+    """Draws a keyboard key icon"""
+    icon = _key_icon_cache.get((key_text, size))
+    if icon is None:
+        icon = _build_key_icon(key_text, size)
+        _key_icon_cache[(key_text, size)] = icon
+    screen.blit(icon, (x, y))
 
 def create_intro_cutscene(screen, screen_size, font):
     """Creates the intro cutscene with WASD/Arrow keys display"""
@@ -379,8 +558,8 @@ def draw_control_hints(screen, screen_size):
     spacing = 10
     
     # Draw "Move with:" text
-    hint_font = pygame.font.SysFont(None, 32)
-    hint_text = hint_font.render("Move with:", True, (255, 255, 255))
+    hint_font = get_font(32)
+    hint_text = cached_render(hint_font, "Move with:", (255, 255, 255))
     screen.blit(hint_text, (center_x - hint_text.get_width() // 2, center_y - 100))
     
     # WASD keys
@@ -391,7 +570,7 @@ def draw_control_hints(screen, screen_size):
     draw_key_icon(screen, center_x + spacing + key_size // 2, wasd_y, "D", key_size)
     
     # "or" text
-    or_text = hint_font.render("SHIFT TO RUN", True, (200, 200, 200))
+    or_text = cached_render(hint_font, "SHIFT TO RUN", (200, 200, 200))
     screen.blit(or_text, (center_x - or_text.get_width() // 2, wasd_y + key_size + 20))
     
 
@@ -477,13 +656,15 @@ class ShaderEffect:
         center_x, center_y = self.screen_w // 2, self.screen_h // 2
         max_dist = math.hypot(center_x, center_y)
         
-        for y in range(0, self.screen_h, 2):  # Step by 2 for performance
-            for x in range(0, self.screen_w, 2):
-                dist = math.hypot(x - center_x, y - center_y)
-                alpha = int(255 * (dist / max_dist) * VIGNETTE_INTENSITY)
-                pygame.draw.rect(surf, (0, 0, 0, alpha), (x, y, 2, 2))
+        # Radial alpha ramp in one NumPy pass (surfarray indexes [x, y])
+        xs = np.arange(self.screen_w, dtype=np.float32)[:, None] - center_x
+        ys = np.arange(self.screen_h, dtype=np.float32)[None, :] - center_y
+        dist = np.hypot(xs, ys)
+        alpha = np.clip(dist * (255.0 * VIGNETTE_INTENSITY / max_dist), 0, 255)
+        pygame.surfarray.pixels_alpha(surf)[:] = alpha.astype(np.uint8)
         
-        return surf
+        # Match the display's pixel layout so the per-frame blit needs no conversion
+        return surf.convert_alpha()
     
     def _create_scanlines(self):
         surf = pygame.Surface((self.screen_w, self.screen_h), pygame.SRCALPHA)
@@ -492,7 +673,7 @@ class ShaderEffect:
         for y in range(0, self.screen_h, 2):
             pygame.draw.line(surf, (0, 0, 0, alpha), (0, y), (self.screen_w, y))
         
-        return surf
+        return surf.convert_alpha()
     
     def apply_chromatic_aberration(self, screen):
         if not ENABLE_CHROMATIC_ABERRATION or CHROMATIC_INTENSITY <= 0:
@@ -518,16 +699,19 @@ class ShaderEffect:
         if not ENABLE_BLOOM:
             return
         
-        small_w, small_h = self.screen_w // 4, self.screen_h // 4
-        bloom_surf = pygame.transform.smoothscale(screen, (small_w, small_h))
+        # Downsample 4x by striding over the screen pixels (nearest-neighbour);
+        # the smooth upscale below blurs the result anyway
+        screen_pixels = pygame.surfarray.pixels3d(screen)
+        bloom_pixels = np.ascontiguousarray(screen_pixels[::4, ::4])
+        del screen_pixels  # Release the pixel lock
         
-        bloom_pixels = pygame.surfarray.pixels3d(bloom_surf)
-        mask = (bloom_pixels[:,:,0] + bloom_pixels[:,:,1] + bloom_pixels[:,:,2]) / 3 > BLOOM_THRESHOLD
-        bloom_pixels[:,:,0] = bloom_pixels[:,:,0] * mask
-        bloom_pixels[:,:,1] = bloom_pixels[:,:,1] * mask
-        bloom_pixels[:,:,2] = bloom_pixels[:,:,2] * mask
-        del bloom_pixels  # Release the pixel lock
+        # Sum channels in uint16 so bright pixels don't wrap around. With the old uint8
+        # sum nothing ever passed the threshold, so this pass used to add no glow at all
+        brightness = bloom_pixels.sum(axis=2, dtype=np.uint16)
+        mask = (brightness > BLOOM_THRESHOLD * 3)[:, :, None]
+        np.multiply(bloom_pixels, mask, out=bloom_pixels)
         
+        bloom_surf = pygame.surfarray.make_surface(bloom_pixels)
         bloom_surf = pygame.transform.smoothscale(bloom_surf, (self.screen_w, self.screen_h))
         bloom_surf.set_alpha(int(255 * BLOOM_INTENSITY))
         
@@ -553,10 +737,14 @@ class GroundRenderer:
         self.tile_size = tile_size
         self.texture = self._load_texture(texture_path)
         self.tint = GROUND_TINT_COLOR
+        self.macro_size = tile_size * GROUND_MACRO_TILES
+        self.macro = self._build_macro_tile()
+        self.baked = {}  # (tx, ty) -> macro tile with obstacle bases composited in
         
     def _load_texture(self, path):
         if os.path.isfile(path):
             try:
+                # convert() (not convert_alpha()): the ground is opaque, so drop any alpha channel
                 texture = pygame.image.load(path).convert()
                 # Scale texture to tile size
                 texture = pygame.transform.scale(texture, (self.tile_size, self.tile_size))
@@ -576,7 +764,8 @@ class GroundRenderer:
             return self._create_fallback_texture()
     
     def _create_fallback_texture(self):
-        texture = pygame.Surface((self.tile_size, self.tile_size))
+        # Opaque and in display format so blits take SDL's straight-copy path
+        texture = pygame.Surface((self.tile_size, self.tile_size)).convert()
         texture.fill((50, 120, 50))
         
         for _ in range(100):
@@ -592,27 +781,53 @@ class GroundRenderer:
         
         return texture
     
+    def _build_macro_tile(self):
+        # The ground is static, so bake a block of tiles once and blit that instead
+        macro = pygame.Surface((self.macro_size, self.macro_size)).convert()
+        for ty in range(GROUND_MACRO_TILES):
+            for tx in range(GROUND_MACRO_TILES):
+                macro.blit(self.texture, (tx * self.tile_size, ty * self.tile_size))
+        return macro
+
+    def bake_obstacle_bases(self, obstacles):
+        """Composites the static obstacle bases into copies of the macro tiles they cover"""
+        ms = self.macro_size
+        self.baked = {}
+        for ob in obstacles:
+            r = ob.collision_rect
+            for ty in range(max(0, r.top // ms), (r.bottom - 1) // ms + 1):
+                for tx in range(max(0, r.left // ms), (r.right - 1) // ms + 1):
+                    tile = self.baked.get((tx, ty))
+                    if tile is None:
+                        tile = self.baked[(tx, ty)] = self.macro.copy()
+                    tile.blit(ob.base_image, (r.left - tx * ms, r.top - ty * ms))
+    
     def draw(self, screen, camera_offset):
-        start_tile_x = max(0, int(camera_offset.x) // self.tile_size)
-        start_tile_y = max(0, int(camera_offset.y) // self.tile_size)
+        ms = self.macro_size
+        start_tile_x = max(0, int(camera_offset.x) // ms)
+        start_tile_y = max(0, int(camera_offset.y) // ms)
         
-        tiles_x = (screen.get_width() // self.tile_size) + 2
-        tiles_y = (screen.get_height() // self.tile_size) + 2
+        tiles_x = (screen.get_width() // ms) + 2
+        tiles_y = (screen.get_height() // ms) + 2
         
-        end_tile_x = min(start_tile_x + tiles_x, (self.world_w // self.tile_size) + 1)
-        end_tile_y = min(start_tile_y + tiles_y, (self.world_h // self.tile_size) + 1)
+        end_tile_x = min(start_tile_x + tiles_x, (self.world_w // ms) + 1)
+        end_tile_y = min(start_tile_y + tiles_y, (self.world_h // ms) + 1)
         
-        for ty in range(start_tile_y, end_tile_y):
-            for tx in range(start_tile_x, end_tile_x):
-                world_x = tx * self.tile_size
-                world_y = ty * self.tile_size
-                screen_x = world_x - int(camera_offset.x)
-                screen_y = world_y - int(camera_offset.y)
-                
-                screen.blit(self.texture, (screen_x, screen_y))
+        ox = int(camera_offset.x)
+        oy = int(camera_offset.y)
+        macro = self.macro
+        baked = self.baked
+        
+        # Submit every visible macro-tile in one C-level blits() call
+        screen.blits([(baked.get((tx, ty), macro), (tx * ms - ox, ty * ms - oy))
+                      for ty in range(start_tile_y, end_tile_y)
+                      for tx in range(start_tile_x, end_tile_x)], doreturn=False)
 
 # ===================== GAME CLASSES =====================
 
+# Pre-sampled shake noise: x offsets read [0, 256), y offsets read [256, 512)
+_SHAKE_LUT = np.random.default_rng().uniform(-1.0, 1.0, 512).tolist()
+
 class Camera:
     def __init__(self, screen_size, world_size):
         self.screen_w, self.screen_h = screen_size
@@ -622,16 +837,21 @@ class Camera:
         self.shake_offset = Vector2(0, 0)
         self.shake_until = 0
         self.shake_intensity = 0
+        # Integer draw offset (camera plus shake), refreshed once per update()
+        self._ox = 0
+        self._oy = 0
     
-    def update(self, target_rect, target_velocity=None):
+    def update(self, target_rect, now_ms, target_velocity=None):
         target_x = target_rect.centerx - self.screen_w // 2
         target_y = target_rect.centery - self.screen_h // 2
         
-        if target_velocity and CAMERA_LOOKAHEAD > 0:
-            if target_velocity.length_squared() > 100:  # Only if moving significantly
-                look_dir = target_velocity.normalize()
-                target_x += look_dir.x * CAMERA_LOOKAHEAD
-                target_y += look_dir.y * CAMERA_LOOKAHEAD
+        if target_velocity is not None and CAMERA_LOOKAHEAD > 0:
+            vx, vy = target_velocity.x, target_velocity.y
+            speed_sq = vx * vx + vy * vy
+            if speed_sq > 100:  # Only if moving significantly
+                look_scale = CAMERA_LOOKAHEAD / math.sqrt(speed_sq)
+                target_x += vx * look_scale
+                target_y += vy * look_scale
         
         target_x = max(0, min(target_x, self.world_w - self.screen_w))
         target_y = max(0, min(target_y, self.world_h - self.screen_h))
@@ -639,41 +859,116 @@ class Camera:
         self.target_offset.x = target_x
         self.target_offset.y = target_y
         
-        self.offset.x += (self.target_offset.x - self.offset.x) * CAMERA_SMOOTHING
-        self.offset.y += (self.target_offset.y - self.offset.y) * CAMERA_SMOOTHING
+        offset = self.offset
+        offset.x += (target_x - offset.x) * CAMERA_SMOOTHING
+        offset.y += (target_y - offset.y) * CAMERA_SMOOTHING
         
-        now = pygame.time.get_ticks()
-        if ENABLE_CAMERA_SHAKE and now < self.shake_until:
-            progress = 1.0 - (self.shake_until - now) / SHAKE_DURATION
+        if ENABLE_CAMERA_SHAKE and now_ms < self.shake_until:
+            progress = 1.0 - (self.shake_until - now_ms) / SHAKE_DURATION
             intensity = self.shake_intensity * (1.0 - progress)  # Fade out
-            self.shake_offset.x = random.uniform(-intensity, intensity)
-            self.shake_offset.y = random.uniform(-intensity, intensity)
+            i = (now_ms >> 4) & 255  # New sample roughly every frame
+            self.shake_offset.x = _SHAKE_LUT[i] * intensity
+            self.shake_offset.y = _SHAKE_LUT[i + 256] * intensity
         else:
             self.shake_offset.x = 0
             self.shake_offset.y = 0
+
+        self._ox = int(offset.x + self.shake_offset.x)
+        self._oy = int(offset.y + self.shake_offset.y)
     
-    def apply(self, rect):
-        return rect.move(
-            -int(self.offset.x + self.shake_offset.x), 
-            -int(self.offset.y + self.shake_offset.y)
-        )
+    @property
+    def view_offset(self):
+        # The shaken offset apply_xy() uses, for layers drawn without a rect
+        return self.offset + self.shake_offset
+
+    def view_rect(self):
+        return pygame.Rect(self._ox, self._oy, self.screen_w, self.screen_h)
+
+    def apply_xy(self, rect):
+        """Screen-space topleft of rect, without allocating a moved Rect"""
+        return (rect.x - self._ox, rect.y - self._oy)
     
-    def shake(self, intensity=SHAKE_INTENSITY, duration=SHAKE_DURATION):
+    def shake(self, now_ms, intensity=SHAKE_INTENSITY, duration=SHAKE_DURATION):
         if ENABLE_CAMERA_SHAKE:
             self.shake_intensity = intensity
-            self.shake_until = pygame.time.get_ticks() + duration
+            self.shake_until = now_ms + duration
+
+class SpatialHashGrid:
+    # Buckets objects under every cell their rect overlaps, so neighbourhood
+    # queries only look at nearby entries instead of scanning the whole group
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def insert(self, rect, obj):
+        cs = self.cell_size
+        for cy in range(rect.top // cs, (rect.bottom - 1) // cs + 1):
+            for cx in range(rect.left // cs, (rect.right - 1) // cs + 1):
+                self.cells.setdefault((cx, cy), []).append(obj)
+
+    def query(self, left, top, right, bottom):
+        """Returns each object whose cells overlap the box, once, in insertion order"""
+        cs = self.cell_size
+        cells = self.cells
+        found = {}
+        for cy in range(int(top) // cs, int(bottom) // cs + 1):
+            for cx in range(int(left) // cs, int(right) // cs + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(dict.fromkeys(bucket))
+        return found.keys()
+
+    def query_rect(self, rect):
+        return self.query(rect.left, rect.top, rect.right - 1, rect.bottom - 1)
+
+def build_obstacle_grid(obstacles, cell_size=OBSTACLE_GRID_CELL):
+    grid = SpatialHashGrid(cell_size)
+    for ob in obstacles:
+        grid.insert(ob.collision_rect, ob)
+    return grid
+
+def obstacle_center_array(obstacles):
+    # Obstacles never move, so their centers are packed once per layout
+    return np.array([(ob.center_vec.x, ob.center_vec.y) for ob in obstacles], dtype=np.float32).reshape(-1, 2)
+
+def build_top_grid(obstacles, cell_size=OBSTACLE_GRID_CELL):
+    # Obstacle tops can overhang their base, so they get their own grid for view culling
+    grid = SpatialHashGrid(cell_size)
+    for ob in obstacles:
+        if ob.top_image:
+            grid.insert(ob.top_rect, ob)
+    return grid
+
+def build_enemy_grid(enemies, cell_size=OBSTACLE_GRID_CELL):
+    # Rebuilt every frame after movement; enemies already caught are left out
+    grid = SpatialHashGrid(cell_size)
+    for en in enemies:
+        if not en.hit:
+            grid.insert(en.rect, en)
+    return grid
 
 class Obstacle(pygame.sprite.Sprite):
+    # Slots make these attribute loads descriptor reads; Sprite's own group bookkeeping stays in __dict__
+    __slots__ = ('base_image', 'top_image', 'rect', 'collision_mask', 'collision_rect', 'opaque_rect', 'top_rect',
+                 'center_vec')
+
     def __init__(self, base_image, top_image, pos):
         super().__init__()
         self.base_image = base_image
         self.top_image = top_image
         self.rect = self.base_image.get_rect(center=pos)
-        self.collision_mask = pygame.mask.from_surface(self.base_image)
+        self.collision_mask = mask_for(self.base_image)
         self.collision_rect = self.base_image.get_rect(center=pos)
+        self.opaque_rect = opaque_bounds(self.base_image).move(self.collision_rect.topleft)
         self.top_rect = self.top_image.get_rect(center=pos) if self.top_image else None
+        # Obstacles never move, so their center is built once here
+        self.center_vec = Vector2(self.collision_rect.center)
 
 class Player(pygame.sprite.Sprite):
+    __slots__ = ('anim', 'state', 'facing', 'frame_idx', 'frame_durations', '_frame_acc', '_run_dur_table',
+                 'audio', 'current_frames', 'current_masks', '_anim_view', '_frame_count', '_base_duration', 'image', 'rect', 'mask', 'pos', 'vel', 'acc', 'stamina', 'hearts',
+                 'flash_until', 'freeze_until', 'pause_until', 'playing_night_animation', 'is_moving', 'is_sprinting')
 
     def __init__(self, animations, pos, frame_durations=None, audio_manager=None):
         super().__init__()
@@ -682,13 +977,14 @@ class Player(pygame.sprite.Sprite):
         self.facing = 'down'
         self.frame_idx = 0
         self.frame_durations = frame_durations or FRAME_DURATION
-        self.last_frame_time = pygame.time.get_ticks()
+        self._frame_acc = 0.0  # Milliseconds accumulated towards the next frame
+        self._run_dur_table = speed_duration_table(self.frame_durations.get('run', 100), 1.4, 0.6, 25)
         self.audio = audio_manager
         
-        self.current_frames = self.anim[self.state][self.facing]
+        self._select_frames()
         self.image = self.current_frames[self.frame_idx]
         self.rect = self.image.get_rect(center=pos)
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = self.current_masks[self.frame_idx]
         
         # Physics
         self.pos = Vector2(pos)
@@ -709,16 +1005,16 @@ class Player(pygame.sprite.Sprite):
         self.is_moving = False
         self.is_sprinting = False
 
-    def play_transition_animation(self):
+    def play_transition_animation(self, now_ms):
         self.playing_night_animation = True
         self.state = 'transition'
         self.frame_idx = 0
-        self.last_frame_time = pygame.time.get_ticks()
-        self.current_frames = self.anim[self.state][self.facing]
+        self._frame_acc = 0.0
+        self._select_frames()
         self.image = self.current_frames[self.frame_idx]
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = self.current_masks[self.frame_idx]
         
-        self.pause_until = pygame.time.get_ticks() + TRANSITION_MS
+        self.pause_until = now_ms + TRANSITION_MS
         
         if self.audio:
             self.audio.play_sound('howl')
@@ -727,16 +1023,19 @@ class Player(pygame.sprite.Sprite):
         self.playing_night_animation = False
         self.state = 'idle'
         self.frame_idx = 0
-        self.last_frame_time = pygame.time.get_ticks()
-
-    def update(self, dt, keys, allow_control=True):
-        now_ms = pygame.time.get_ticks()
-        
-        if now_ms < self.pause_until:
-            self.vel *= 0.9
-            self.pos += self.vel * dt
-            self.rect.center = (int(self.pos.x), int(self.pos.y))
-            self._update_animation()
+        self._frame_acc = 0.0
+
+    def update(self, dt, keys, now_ms, allow_control=True):
+        if now_ms < self.pause_until or now_ms < self.freeze_until:
+            # Paused or frozen: coast to a stop, updating vel/pos in place
+            vx = self.vel.x * 0.9
+            vy = self.vel.y * 0.9
+            px = self.pos.x + vx * dt
+            py = self.pos.y + vy * dt
+            self.vel.update(vx, vy)
+            self.pos.update(px, py)
+            self.rect.center = (int(px), int(py))
+            self._update_animation(dt)
             # Stop movement sounds when paused
             if self.audio:
                 self.audio.stop_movement_sounds()
@@ -744,129 +1043,137 @@ class Player(pygame.sprite.Sprite):
             self.is_sprinting = False
             return
         
-        if now_ms < self.freeze_until:
-            self.vel *= 0.9
-            self.pos += self.vel * dt
-            self.rect.center = (int(self.pos.x), int(self.pos.y))
-            self._update_animation()
-            if self.audio:
-                self.audio.stop_movement_sounds()
-            self.is_moving = False
-            self.is_sprinting = False
-            return
-        
         if self.playing_night_animation and now_ms >= self.pause_until:
             self.stop_night_animation()
         
         if not self.playing_night_animation:
             sprinting = (keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]) and self.stamina > STAMINA_MIN_TO_SPRINT and allow_control
-            move = Vector2(0, 0)
+            # Plain float math on the components; vel/pos are written back in place once
+            mx = my = 0.0
             
             if allow_control:
-                if keys[pygame.K_w] or keys[pygame.K_UP]: move.y = -1
-                if keys[pygame.K_s] or keys[pygame.K_DOWN]: move.y = 1
-                if keys[pygame.K_a] or keys[pygame.K_LEFT]: move.x = -1
-                if keys[pygame.K_d] or keys[pygame.K_RIGHT]: move.x = 1
+                if keys[pygame.K_w] or keys[pygame.K_UP]: my = -1.0
+                if keys[pygame.K_s] or keys[pygame.K_DOWN]: my = 1.0
+                if keys[pygame.K_a] or keys[pygame.K_LEFT]: mx = -1.0
+                if keys[pygame.K_d] or keys[pygame.K_RIGHT]: mx = 1.0
             
             speed_cap = MAX_SPEED * (SPRINT_MULTIPLIER if sprinting else 1.0)
             
-            is_currently_moving = move.length_squared() > 0
+            is_currently_moving = mx != 0.0 or my != 0.0
+            vel, pos = self.vel, self.pos
+            vx, vy = vel.x, vel.y
             
             if is_currently_moving:
-                move = move.normalize()
-                desired = move * speed_cap
-                change = desired - self.vel
+                scale = speed_cap / math.hypot(mx, my)
+                cx = mx * scale - vx
+                cy = my * scale - vy
                 max_change = ACCELERATION * dt
-                if change.length() > max_change:
-                    change = change.normalize() * max_change
-                self.vel += change
+                change_sq = cx * cx + cy * cy
+                if change_sq > max_change * max_change:
+                    k = max_change / math.sqrt(change_sq)
+                    cx *= k
+                    cy *= k
+                vx += cx
+                vy += cy
             else:
                 # Apply friction when not moving
-                if self.vel.length_squared() > 0:
+                speed_sq = vx * vx + vy * vy
+                if speed_sq > 0:
                     decel = FRICTION * dt
-                    if self.vel.length() <= decel:
-                        self.vel = Vector2(0, 0)
+                    speed = math.sqrt(speed_sq)
+                    if speed <= decel:
+                        vx = vy = 0.0
                     else:
-                        self.vel -= self.vel.normalize() * decel
+                        k = (speed - decel) / speed
+                        vx *= k
+                        vy *= k
             
-            if self.vel.length() > speed_cap:
-                self.vel.scale_to_length(speed_cap)
+            speed_sq = vx * vx + vy * vy
+            if speed_sq > speed_cap * speed_cap:
+                k = speed_cap / math.sqrt(speed_sq)
+                vx *= k
+                vy *= k
+                speed_sq = vx * vx + vy * vy
+            vel.update(vx, vy)
             
-            self.pos += self.vel * dt
-            self.pos.x = max(0, min(self.pos.x, WORLD_SIZE[0]))
-            self.pos.y = max(0, min(self.pos.y, WORLD_SIZE[1]))
-            self.rect.center = (int(self.pos.x), int(self.pos.y))
+            px = max(0, min(pos.x + vx * dt, WORLD_SIZE[0]))
+            py = max(0, min(pos.y + vy * dt, WORLD_SIZE[1]))
+            pos.update(px, py)
+            self.rect.center = (int(px), int(py))
             
-            if self.vel.length_squared() > 10:
+            if speed_sq > 10:
                 self.state = 'run'
-                self.facing = facing_from_vector(self.vel)
+                self.facing = facing_from_vector(vel)
             else:
                 self.state = 'idle'
             
-            if self.audio:
-                if is_currently_moving and self.vel.length() > 10:
+            audio = self.audio
+            if audio:
+                if is_currently_moving and speed_sq > 100:
                     if sprinting and not self.is_sprinting:
                         # Switched to sprinting
-                        self.audio.stop_movement_sounds()
-                        self.audio.play_movement_sound('running')
+                        audio.stop_movement_sounds()
+                        audio.play_movement_sound('running')
                         self.is_sprinting = True
                         self.is_moving = True
                     elif not sprinting and (self.is_sprinting or not self.is_moving):
                         # Switched to walking or just started moving
-                        self.audio.stop_movement_sounds()
-                        self.audio.play_movement_sound('walking')
+                        audio.stop_movement_sounds()
+                        audio.play_movement_sound('walking')
                         self.is_sprinting = False
                         self.is_moving = True
                 else:
                     # Stopped moving
                     if self.is_moving:
-                        self.audio.stop_movement_sounds()
+                        audio.stop_movement_sounds()
                         self.is_moving = False
                         self.is_sprinting = False
             
             # Update stamina
-            if sprinting and move.length_squared() > 0:
-                self.stamina -= STAMINA_DRAIN_PER_SEC * dt
-                self.stamina = max(0.0, self.stamina)
+            if sprinting and is_currently_moving:
+                self.stamina = max(0.0, self.stamina - STAMINA_DRAIN_PER_SEC * dt)
             else:
-                self.stamina += STAMINA_RECOVER_PER_SEC * dt
-                self.stamina = min(STAMINA_MAX, self.stamina)
+                self.stamina = min(STAMINA_MAX, self.stamina + STAMINA_RECOVER_PER_SEC * dt)
         
-        self._update_animation()
+        self._update_animation(dt)
 
-    def _update_animation(self):
-        now = pygame.time.get_ticks()
-        
-        # Get current animation frames
+    def _select_frames(self):
+        # Resolve frames and base duration; only needed when anim, state or facing changes
+        self._anim_view = (self.anim, self.state, self.facing)
         self.current_frames = self.anim[self.state].get(self.facing, self.anim[self.state]['down'])
+        self.current_masks = frame_masks(self.current_frames)
+        self._frame_count = len(self.current_frames)
+        self._base_duration = self.frame_durations.get(self.state, 100)
+
+    def _update_animation(self, dt):
+        # Get current animation frames
+        if (self.anim, self.state, self.facing) != self._anim_view:
+            self._select_frames()
         
         # Calculate frame duration (faster when moving fast)
-        base_duration = self.frame_durations.get(self.state, 100)
-        
         if self.state == 'run':
             # Make run animation speed match movement speed
             speed = self.vel.length()
-            max_possible = MAX_SPEED * SPRINT_MULTIPLIER
-            speed_ratio = min(1.0, speed / max_possible)
-            scale = 1.4 - 0.8 * speed_ratio
-            duration = max(25, int(base_duration * scale))
+            bucket = int(speed * ANIM_SPEED_BUCKETS / (MAX_SPEED * SPRINT_MULTIPLIER))
+            duration = self._run_dur_table[min(ANIM_SPEED_BUCKETS - 1, bucket)]
         else:
-            duration = base_duration
+            duration = self._base_duration
         
-        # Check if it's time for next frame
-        if now - self.last_frame_time >= duration:
-            self.frame_idx = (self.frame_idx + 1) % len(self.current_frames)
-            self.last_frame_time = now
+        # Advance by however many frames fit in the accumulated time
+        self._frame_acc += dt * 1000.0
+        if self._frame_acc >= duration:
+            steps, self._frame_acc = divmod(self._frame_acc, duration)
+            self.frame_idx = (self.frame_idx + int(steps)) % self._frame_count
             self.image = self.current_frames[self.frame_idx]
-            self.mask = pygame.mask.from_surface(self.image)
+            self.mask = self.current_masks[self.frame_idx]
 
-    def collide_with_obstacle(self, obstacle):
-        dir_vec = (self.pos - Vector2(obstacle.collision_rect.center))
+    def collide_with_obstacle(self, obstacle, now_ms):
+        dir_vec = (self.pos - obstacle.center_vec)
         if dir_vec.length_squared() == 0:
             dir_vec = Vector2(random.uniform(-1, 1), random.uniform(-1, 1))
         dir_vec = dir_vec.normalize()
         self.vel = dir_vec * KNOCKBACK_SPEED
-        self.freeze_until = pygame.time.get_ticks() + 500
+        self.freeze_until = now_ms + 500
         
         # Play pushback sound
         if self.audio:
@@ -874,13 +1181,13 @@ class Player(pygame.sprite.Sprite):
         
         return True  # Signal that collision occurred
 
-    def hit_by_enemy(self, enemy):
+    def hit_by_enemy(self, enemy, now_ms):
         dir_vec = (self.pos - Vector2(enemy.rect.center))
         if dir_vec.length_squared() == 0:
             dir_vec = Vector2(random.uniform(-1, 1), random.uniform(-1, 1))
         dir_vec = dir_vec.normalize()
         self.vel = dir_vec * KNOCKBACK_SPEED
-        self.flash_until = pygame.time.get_ticks() + HIT_FLASH_MS
+        self.flash_until = now_ms + HIT_FLASH_MS
         
         # Play hurt sound
         if self.audio:
@@ -897,18 +1204,17 @@ class Player(pygame.sprite.Sprite):
 def build_nav_grid(world_size, cell_size, obstacles, expand_cells=1):
     cols = math.ceil(world_size[0] / cell_size)
     rows = math.ceil(world_size[1] / cell_size)
-    grid = [[0 for _ in range(cols)] for _ in range(rows)]
+    grid = np.zeros((rows, cols), dtype=np.uint8)
     
     for ob in obstacles:
         r = ob.collision_rect
-        left = max(0, r.left // cell_size)
-        right = min(cols-1, r.right // cell_size)
-        top = max(0, r.top // cell_size)
-        bottom = min(rows-1, r.bottom // cell_size)
-        
-        for cy in range(max(0, top - expand_cells), min(rows, bottom + 1 + expand_cells)):
-            for cx in range(max(0, left - expand_cells), min(cols, right + 1 + expand_cells)):
-                grid[cy][cx] = 1
+        left = max(0, r.left // cell_size - expand_cells)
+        right = min(cols, r.right // cell_size + 1 + expand_cells)
+        top = max(0, r.top // cell_size - expand_cells)
+        bottom = min(rows, r.bottom // cell_size + 1 + expand_cells)
+        
+        # One slice fill per obstacle (blocked cells plus the expansion margin)
+        grid[top:bottom, left:right] = 1
     
     return grid
 
@@ -922,97 +1228,338 @@ def cell_to_world_center(cx, cy, cell_size):
     y = cy * cell_size + cell_size // 2
     return Vector2(x, y)
 
-def neighbors_for(cx, cy, grid):
-    rows = len(grid)
-    cols = len(grid[0])
+SQRT2 = math.sqrt(2.0)
+
+# (dx, dy, move cost) for the 8 neighbours; diagonal moves cost more
+_NEIGHBOR_OFFSETS = (
+    (-1, -1, SQRT2), (0, -1, 1.0), (1, -1, SQRT2),
+    (-1, 0, 1.0),                  (1, 0, 1.0),
+    (-1, 1, SQRT2),  (0, 1, 1.0),  (1, 1, SQRT2),
+)
+
+def neighbors_for(cx, cy, walls, cols, rows):
+    # walls is the nav grid flattened row-major (see adjacency_for)
     nbrs = []
     
-    for dy in (-1, 0, 1):
-        for dx in (-1, 0, 1):
-            if dx == 0 and dy == 0:
-                continue
-            nx = cx + dx
-            ny = cy + dy
-            if 0 <= nx < cols and 0 <= ny < rows and grid[ny][nx] == 0:
-                # Diagonal moves cost more
-                cost = math.hypot(dx, dy)
-                nbrs.append((nx, ny, cost))
+    for dx, dy, cost in _NEIGHBOR_OFFSETS:
+        nx = cx + dx
+        ny = cy + dy
+        if 0 <= nx < cols and 0 <= ny < rows and walls[ny * cols + nx] == 0:
+            nbrs.append((nx, ny, cost))
     
     return nbrs
 
+_adjacency_cache = (None, None)  # (grid, adjacency) for the most recent grid
+
+def adjacency_for(grid):
+    """Per-cell tuples of (neighbour id, move cost), built once per nav grid"""
+    global _adjacency_cache
+    cached_grid, adj = _adjacency_cache
+    if cached_grid is grid:
+        return adj
+    rows, cols = grid.shape
+    walls = grid.tobytes()
+    adj = [()] * (rows * cols)
+    for cy in range(rows):
+        for cx in range(cols):
+            if walls[cy * cols + cx] == 0:
+                adj[cy * cols + cx] = tuple((ny * cols + nx, cost) for nx, ny, cost in neighbors_for(cx, cy, walls, cols, rows))
+    _adjacency_cache = (grid, adj)
+    return adj
+
 def heuristic(a, b):
+    # Octile distance: exact cost on an open 8-connected grid, so it never overestimates
     (ax, ay) = a
     (bx, by) = b
-    return math.hypot(bx - ax, by - ay)
-
-def a_star(grid, start, goal, max_nodes=25000):
-    if start == goal:
-        return [start]
-    
-    rows = len(grid)
-    cols = len(grid[0])
-    sx, sy = start
-    gx, gy = goal
-    
-    # Validate start and goal
-    if not (0 <= sx < cols and 0 <= sy < rows):
-        return None
-    if not (0 <= gx < cols and 0 <= gy < rows):
-        return None
-    if grid[sy][sx] == 1 or grid[gy][gx] == 1:
-        return None
-    
-    # A* algorithm
-    open_heap = []
-    heapq.heappush(open_heap, (0 + heuristic(start, goal), 0, start))
-    came_from = {}
-    gscore = {start: 0}
-    visited = 0
-    
-    while open_heap:
-        f, g, current = heapq.heappop(open_heap)
-        visited += 1
-        
-        if visited > max_nodes:
-            return None  # Path too complex
-        
-        if current == goal:
-            path = [current]
-            while current in came_from:
-                current = came_from[current]
-                path.append(current)
-            path.reverse()
-            return path
-        
-        cx, cy = current
-        for nx, ny, cost in neighbors_for(cx, cy, grid):
-            neigh = (nx, ny)
-            tentative_g = gscore[current] + cost
+    dx = abs(bx - ax)
+    dy = abs(by - ay)
+    return (dx + dy) + (SQRT2 - 2.0) * min(dx, dy)
+
+_padded_walls_cache = (None, None)  # (grid, walls) for the most recent grid
+
+def padded_walls_for(grid):
+    """Nav grid as bytes with a one-cell wall border, so jump scans need no bounds checks"""
+    global _padded_walls_cache
+    cached_grid, walls = _padded_walls_cache
+    if cached_grid is not grid:
+        walls = np.pad(grid, 1, constant_values=1).tobytes()
+        _padded_walls_cache = (grid, walls)
+    return walls
+
+def _jump(walls, width, node, dx, dy, goal):
+    """Scans from node along (dx, dy) over padded ids; returns the next jump point, or -1 at a wall"""
+    step = dy * width + dx
+    while True:
+        node += step
+        if walls[node]:
+            return -1
+        if node == goal:
+            return node
+        if dx and dy:
+            # A wall beside the diagonal opens a forced neighbour behind it
+            if (walls[node - dx] and not walls[node - dx + dy * width]) or \
+               (walls[node - dy * width] and not walls[node + dx - dy * width]):
+                return node
+            # Diagonal cells are jump points when a straight scan from them finds one
+            if _jump(walls, width, node, dx, 0, goal) >= 0 or _jump(walls, width, node, 0, dy, goal) >= 0:
+                return node
+        elif dx:
+            if (walls[node + width] and not walls[node + width + dx]) or \
+               (walls[node - width] and not walls[node - width + dx]):
+                return node
+        else:
+            if (walls[node + 1] and not walls[node + 1 + step]) or \
+               (walls[node - 1] and not walls[node - 1 + step]):
+                return node
+
+def _jump_directions(walls, width, node, dx, dy):
+    # Pruned successor directions for a node entered moving (dx, dy): the natural ones plus any forced by walls
+    if dx and dy:
+        dirs = [(dx, dy), (dx, 0), (0, dy)]
+        if walls[node - dx]:
+            dirs.append((-dx, dy))
+        if walls[node - dy * width]:
+            dirs.append((dx, -dy))
+    elif dx:
+        dirs = [(dx, 0)]
+        if walls[node + width]:
+            dirs.append((dx, 1))
+        if walls[node - width]:
+            dirs.append((dx, -1))
+    else:
+        dirs = [(0, dy)]
+        if walls[node + 1]:
+            dirs.append((1, dy))
+        if walls[node - 1]:
+            dirs.append((-1, dy))
+    return dirs
+
+_ALL_DIRECTIONS = tuple((dx, dy) for dx, dy, _ in _NEIGHBOR_OFFSETS)
+
+class Pathfinder:
+    # Owns the search work buffers so repeated searches don't reallocate them;
+    # only the cells a search touched are reset afterwards
+
+    def __init__(self, size=0):
+        self._g = []
+        self._came = []
+        self._closed = bytearray()
+        self._touched = []
+        self.reserve(size)
+
+    def reserve(self, size):
+        grow = size - len(self._g)
+        if grow > 0:
+            self._g.extend([math.inf] * grow)
+            self._came.extend([-1] * grow)
+            self._closed.extend(bytes(grow))
+
+    def find_jump_path(self, grid, start, goal, max_nodes=25000):
+        """Jump point search: optimal 8-way grid path, but only jump points enter the heap"""
+        if start == goal:
+            return [start]
+        
+        rows, cols = grid.shape
+        sx, sy = start
+        gx, gy = goal
+        
+        if not (0 <= sx < cols and 0 <= sy < rows):
+            return None
+        if not (0 <= gx < cols and 0 <= gy < rows):
+            return None
+        if grid[sy, sx] == 1 or grid[gy, gx] == 1:
+            return None
+        
+        # Node ids index the padded grid: (y + 1) * width + (x + 1)
+        walls = padded_walls_for(grid)
+        width = cols + 2
+        self.reserve(len(walls))
+        gscore = self._g
+        came_from = self._came
+        closed = self._closed
+        touched = self._touched
+        
+        start_id = (sy + 1) * width + sx + 1
+        goal_id = (gy + 1) * width + gx + 1
+        gscore[start_id] = 0.0
+        touched.append(start_id)
+        
+        seq = 0
+        open_heap = [(heuristic(start, goal), seq, start_id)]
+        visited = 0
+        jump_points = None
+        
+        while open_heap:
+            f, _, current = heapq.heappop(open_heap)
+            if closed[current]:
+                continue
+            closed[current] = 1
+            visited += 1
             
-            if neigh not in gscore or tentative_g < gscore[neigh]:
-                came_from[neigh] = current
-                gscore[neigh] = tentative_g
-                fscore = tentative_g + heuristic(neigh, goal)
-                heapq.heappush(open_heap, (fscore, tentative_g, neigh))
-    
-    return None
+            if visited > max_nodes:
+                break
+            
+            if current == goal_id:
+                jump_points = []
+                while current != -1:
+                    jump_points.append((current % width - 1, current // width - 1))
+                    current = came_from[current]
+                jump_points.reverse()
+                break
+            
+            cy, cx = divmod(current, width)
+            parent = came_from[current]
+            if parent == -1:
+                dirs = _ALL_DIRECTIONS
+            else:
+                py, px = divmod(parent, width)
+                dirs = _jump_directions(walls, width, current, (cx > px) - (cx < px), (cy > py) - (cy < py))
+            
+            g = gscore[current]
+            for dx, dy in dirs:
+                neigh = _jump(walls, width, current, dx, dy, goal_id)
+                if neigh < 0 or closed[neigh]:
+                    continue
+                ny, nx = divmod(neigh, width)
+                # Jump points lie on a straight or diagonal line, so the octile distance is the exact cost
+                tentative_g = g + heuristic((cx, cy), (nx, ny))
+                if tentative_g < gscore[neigh]:
+                    if gscore[neigh] == math.inf:
+                        touched.append(neigh)
+                    came_from[neigh] = current
+                    gscore[neigh] = tentative_g
+                    seq -= 1
+                    heapq.heappush(open_heap, (tentative_g + heuristic((nx - 1, ny - 1), goal), seq, neigh))
+        
+        for node in touched:
+            gscore[node] = math.inf
+            came_from[node] = -1
+            closed[node] = 0
+        touched.clear()
+        
+        if jump_points is None:
+            return None
+        
+        # Fill in the cells between jump points so callers still get a step-by-step path
+        path = [jump_points[0]]
+        for (x, y) in jump_points[1:]:
+            px, py = path[-1]
+            dx = (x > px) - (x < px)
+            dy = (y > py) - (y < py)
+            while (px, py) != (x, y):
+                px += dx
+                py += dy
+                path.append((px, py))
+        return path
+
+_pathfinder = Pathfinder()
+
+def jps(grid, start, goal, max_nodes=25000):
+    return _pathfinder.find_jump_path(grid, start, goal, max_nodes)
+
+_path_cache = (None, {})  # (grid, {(start, goal): path}) for the most recent grid
+
+def cached_path(grid, start, goal):
+    """jps() result memoized per nav grid, unreachable goals included; callers must not mutate it"""
+    global _path_cache
+    cached_grid, paths = _path_cache
+    if cached_grid is not grid:
+        paths = {}
+        _path_cache = (grid, paths)
+    key = (start, goal)
+    if key in paths:
+        return paths[key]
+    if len(paths) >= PATH_CACHE_SIZE:
+        del paths[next(iter(paths))]  # Oldest first
+    path = paths[key] = jps(grid, start, goal)
+    return path
+
+class SharedPathSearch:
+    # Reverse Dijkstra rooted at a goal cell. It is expanded lazily, only until the
+    # asking cell is settled, and shared by every caller heading for that goal, so
+    # the parent pointers act as a flow field: each settled cell points one step on
+    # a shortest path to the goal, and next_cell reads it
+
+    def __init__(self, grid, goal):
+        self.grid = grid
+        self.goal = goal
+        self.rows, self.cols = grid.shape
+        self.adj = adjacency_for(grid)
+        size = self.rows * self.cols
+        self.dist = [math.inf] * size
+        self.parent = [-1] * size
+        self.closed = bytearray(size)
+        self.heap = []
+        gx, gy = goal
+        if 0 <= gx < self.cols and 0 <= gy < self.rows and grid[gy, gx] == 0:
+            goal_id = gy * self.cols + gx
+            self.dist[goal_id] = 0.0
+            self.heap.append((0.0, goal_id))
+
+    def _settle(self, start):
+        # Flat id of start once its distance is final, or None if unreachable
+        sx, sy = start
+        cols, rows = self.cols, self.rows
+        if not (0 <= sx < cols and 0 <= sy < rows) or self.grid[sy, sx] == 1:
+            return None
+        
+        start_id = sy * cols + sx
+        adj, dist, parent, closed, heap = self.adj, self.dist, self.parent, self.closed, self.heap
+        while not closed[start_id] and heap:
+            d, current = heapq.heappop(heap)
+            if closed[current]:
+                continue  # Stale entry for a node already settled
+            closed[current] = 1
+            for neigh, cost in adj[current]:
+                nd = d + cost
+                if not closed[neigh] and nd < dist[neigh]:
+                    dist[neigh] = nd
+                    parent[neigh] = current
+                    heapq.heappush(heap, (nd, neigh))
+        return start_id if closed[start_id] else None
+
+    def next_cell(self, start):
+        """Returns the cell one step from start towards the goal, or None at the goal or if unreachable"""
+        start_id = self._settle(start)
+        if start_id is None or self.parent[start_id] == -1:
+            return None
+        parent = self.parent[start_id]
+        return (parent % self.cols, parent // self.cols)
+
+_shared_search = None
+
+def shared_search(grid, goal):
+    """Returns the SharedPathSearch for (grid, goal), starting a new one when either changes"""
+    global _shared_search
+    if _shared_search is None or _shared_search.grid is not grid or _shared_search.goal != goal:
+        _shared_search = SharedPathSearch(grid, goal)
+    return _shared_search
 
 # ===================== ENEMY CLASS =====================
 
+_NO_STEER = Vector2(0, 0)  # Shared "no preferred direction"; never mutated
+
 class Enemy(pygame.sprite.Sprite):
+    __slots__ = ('anims', 'frame_durations', '_dur_tables', 'state', 'facing', 'frame_idx', 'last_frame_time',
+                 'current_frames', 'current_masks', '_anim_view', '_frame_count', 'image', 'rect', 'mask', 'pos', 'vel', 'nav_grid', 'cell_size', 'path',
+                 'path_cells', 'path_idx', 'next_recalc', 'recalc_interval', 'last_player_cell', 'mode',
+                 'hit', 'hit_time')
+
     def __init__(self, pos, nav_grid, cell_size, anims, frame_durations):
         super().__init__()
         self.anims = anims
         self.frame_durations = frame_durations or FRAME_DURATION
+        self._dur_tables = {state: speed_duration_table(self.frame_durations.get(state, 120), 1.2, 0.3, 30)
+                            for state in ('idle', 'run')}
         self.state = 'idle'
         self.facing = 'down'
         self.frame_idx = 0
         self.last_frame_time = pygame.time.get_ticks()
         
-        self.current_frames = self.anims[self.state][self.facing]
+        self._select_frames()
         self.image = self.current_frames[self.frame_idx]
         self.rect = self.image.get_rect(center=pos)
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = self.current_masks[self.frame_idx]
         
         self.pos = Vector2(pos)
         self.vel = Vector2(0, 0)
@@ -1022,7 +1569,7 @@ class Enemy(pygame.sprite.Sprite):
         self.path = []
         self.path_cells = []
         self.path_idx = 0
-        self.last_recalc = -9999.0
+        self.next_recalc = -math.inf  # Time of the next allowed repath; -inf forces one
         self.recalc_interval = PATH_RECALC_INTERVAL
         self.last_player_cell = None
         
@@ -1030,23 +1577,20 @@ class Enemy(pygame.sprite.Sprite):
         self.hit = False
         self.hit_time = 0
 
-    def request_path_to(self, player_pos, current_time):
-        pcx, pcy = world_to_cell(player_pos, self.cell_size)
-        scx, scy = world_to_cell(self.pos, self.cell_size)
+    def request_path_to(self, player_cell, current_time):
         now = current_time
         
-        if (now - self.last_recalc) < self.recalc_interval:
+        if now < self.next_recalc:
             return
         
-        self.last_recalc = now
-        rows = len(self.nav_grid)
-        cols = len(self.nav_grid[0])
+        jitter = self.recalc_interval * PATH_RECALC_JITTER
+        self.next_recalc = now + self.recalc_interval + random.uniform(-jitter, jitter)
+        pcx, pcy = player_cell
+        scx, scy = world_to_cell(self.pos, self.cell_size)
+        rows, cols = self.nav_grid.shape
         
-        # Choose goal based on mode
-        if self.mode == 'chase':
-            # Go toward player
-            goal = (pcx, pcy)
-        elif self.mode == 'flee':
+        # Choose goal based on mode; chasers steer by the shared flow field instead
+        if self.mode == 'flee':
             # Run away from player
             gx = scx + (scx - pcx)
             gy = scy + (scy - pcy)
@@ -1055,13 +1599,13 @@ class Enemy(pygame.sprite.Sprite):
             goal = (gx, gy)
             
             # If flee target is blocked, try corners
-            if self.nav_grid[goal[1]][goal[0]] == 1:
+            if self.nav_grid[goal[1], goal[0]] == 1:
                 corners = [(0, 0), (cols-1, 0), (0, rows-1), (cols-1, rows-1)]
                 best = None
                 best_d = -1
                 for c in corners:
                     cx, cy = c
-                    if self.nav_grid[cy][cx] == 0:
+                    if self.nav_grid[cy, cx] == 0:
                         d = math.hypot(cx - pcx, cy - pcy)
                         if d > best_d:
                             best_d = d
@@ -1069,146 +1613,171 @@ class Enemy(pygame.sprite.Sprite):
                 if best:
                     goal = best
         else:
-            return  # No pathfinding in halt mode
+            return  # Chase follows the flow field; halt doesn't move
         
-        path_cells = a_star(self.nav_grid, (scx, scy), goal)
+        path_cells = cached_path(self.nav_grid, (scx, scy), goal)
         if not path_cells:
             self.path = []
             self.path_idx = 0
             return
         
-        world_path = [cell_to_world_center(cx, cy, self.cell_size) for (cx, cy) in path_cells]
-        
-        compressed = []
-        for i, pt in enumerate(world_path):
-            if i == 0 or i == len(world_path)-1:
-                compressed.append(pt)
-                continue
-            prev = world_path[i-1]
-            nxt = world_path[i+1]
-            dir1 = (pt - prev)
-            dir2 = (nxt - pt)
-            if dir1.length_squared() == 0 or dir2.length_squared() == 0:
-                compressed.append(pt)
-                continue
-            dir1 = dir1.normalize()
-            dir2 = dir2.normalize()
-            if dir1.dot(dir2) < 0.999:
-                compressed.append(pt)
+        # Steps between path cells are single 8-way moves, so a waypoint is only
+        # needed where the step direction changes (plus both ends)
+        keep = [path_cells[0]]
+        for (px, py), (cx, cy), (nx, ny) in zip(path_cells, path_cells[1:], path_cells[2:]):
+            if cx - px != nx - cx or cy - py != ny - cy:
+                keep.append((cx, cy))
+        if len(path_cells) > 1:
+            keep.append(path_cells[-1])
         
-        self.path = compressed
+        self.path = [cell_to_world_center(cx, cy, self.cell_size) for (cx, cy) in keep]
         self.path_idx = 0
 
-    def update_animation(self):
-        now = pygame.time.get_ticks()
-        speed = self.vel.length()
+    def _select_frames(self):
+        # Resolve frames for the current state and facing; only needed when either changes
+        self._anim_view = (self.state, self.facing)
+        self.current_frames = self.anims[self.state].get(self.facing, self.anims[self.state]['down'])
+        self.current_masks = frame_masks(self.current_frames)
+        self._frame_count = len(self.current_frames)
+
+    def update_animation(self, now):
+        vel = self.vel
+        speed = vel.length()
+        moving = speed > 4.0
         
-        prev_state = self.state
-        self.state = 'run' if speed > 4.0 else 'idle'
+        state = self.state = 'run' if moving else 'idle'
         
-        if speed > 4.0:
-            self.facing = facing_from_vector(self.vel)
+        if moving:
+            self.facing = facing_from_vector(vel)
         
-        self.current_frames = self.anims[self.state].get(self.facing, self.anims[self.state]['down'])
+        if (state, self.facing) != self._anim_view:
+            self._select_frames()
         
-        base = self.frame_durations.get(self.state, 120)
-        ratio = min(1.0, speed / ENEMY_MAX_SPEED)
-        scale = 1.2 - 0.9 * ratio
-        dur = max(30, int(base * scale))
+        bucket = int(speed * ANIM_SPEED_BUCKETS / ENEMY_MAX_SPEED)
+        dur = self._dur_tables[state][min(ANIM_SPEED_BUCKETS - 1, bucket)]
         
         # Update frame
         if now - self.last_frame_time >= dur:
-            self.frame_idx = (self.frame_idx + 1) % len(self.current_frames)
+            self.frame_idx = (self.frame_idx + 1) % self._frame_count
             self.last_frame_time = now
             self.image = self.current_frames[self.frame_idx]
-            self.mask = pygame.mask.from_surface(self.image)
+            self.mask = self.current_masks[self.frame_idx]
 
-    def update(self, dt, player, obstacles_group, all_enemies, current_time):
-        if self.hit:
-            return  # Don't move if caught
-        
+    def steering(self, player, player_cell, current_time):
+        """Returns the raw desired direction; obstacle avoidance is summed for the whole swarm by compute_avoidance"""
         # Get path to/from player
-        self.request_path_to(player.pos, current_time)
-        
-        sep = Vector2(0, 0)
-        for other in all_enemies:
-            if other is self:
-                continue
-            d = self.pos.distance_to(other.pos)
-            if d < SEPARATION_RADIUS and d > 0:
-                away = (self.pos - other.pos) / (d * d)
-                sep += away
-        if sep.length_squared() > 0:
-            sep = sep.normalize() * (SEPARATION_FORCE * dt)
-        
-        avoid = Vector2(0, 0)
-        avoid_radius = max(self.cell_size * 0.8, 32)
-        avoid_force = 600.0
-        for ob in obstacles_group:
-            ob_center = Vector2(ob.collision_rect.center)
-            d = self.pos.distance_to(ob_center)
-            if d < avoid_radius and d > 0:
-                repulse = (self.pos - ob_center) / (d * d)
-                avoid += repulse
-        if avoid.length_squared() > 0:
-            avoid = avoid.normalize() * (avoid_force * dt)
-
-        # Path-following / behavior-based desired velocity
-        target_vel = Vector2(0, 0)
-        if self.path and self.path_idx < len(self.path):
+        self.request_path_to(player_cell, current_time)
+
+        # Path-following / behavior-based desired direction
+        desired = _NO_STEER
+        if self.mode == 'chase':
+            # Every chaser shares one search rooted at the player's cell; rebuilt only when that cell changes
+            field = shared_search(self.nav_grid, player_cell)
+            step = field.next_cell(world_to_cell(self.pos, self.cell_size))
+            target = cell_to_world_center(step[0], step[1], self.cell_size) if step else player.pos
+            desired = (target - self.pos)
+        elif self.path and self.path_idx < len(self.path):
             target = self.path[self.path_idx]
-            if self.pos.distance_to(target) < max(10.0, self.cell_size * 0.35):
+            reach = max(10.0, self.cell_size * 0.35)
+            if self.pos.distance_squared_to(target) < reach * reach:
                 self.path_idx += 1
             else:
                 desired = (target - self.pos)
-                if desired.length_squared() > 0:
-                    target_vel = desired.normalize() * ENEMY_MAX_SPEED
-        else:
-            if self.mode == 'chase':
-                desired = (player.pos - self.pos)
-                if desired.length_squared() > 0:
-                    target_vel = desired.normalize() * ENEMY_MAX_SPEED
-            elif self.mode == 'flee':
-                desired = (self.pos - player.pos)
-                if desired.length_squared() > 0:
-                    target_vel = desired.normalize() * ENEMY_MAX_SPEED
-
-        steer = target_vel - self.vel
-        steer += sep
-        steer += avoid
-
-        max_change = ENEMY_ACCELERATION * dt
-        if steer.length() > max_change:
-            steer = steer.normalize() * max_change
-        self.vel += steer
-        if self.vel.length() > ENEMY_MAX_SPEED:
-            self.vel.scale_to_length(ENEMY_MAX_SPEED)
-
-        next_pos = self.pos + self.vel * dt
-        next_rect = self.rect.copy()
-        next_rect.center = (int(next_pos.x), int(next_pos.y))
+        elif self.mode == 'flee':
+            desired = (self.pos - player.pos)
+        return desired
+
+    def move(self, vel, next_pos, obstacle_grid, now_ms):
+        """Takes the stepped velocity and position from SwarmState, resolving obstacle hits"""
+        self.vel.update(float(vel[0]), float(vel[1]))
+        nx, ny = float(next_pos[0]), float(next_pos[1])
+        # Topleft the rect would have if centred on next_pos (rect size never changes)
+        left = int(nx) - self.rect.width // 2
+        top = int(ny) - self.rect.height // 2
         collided = False
-        for ob in obstacles_group:
-            if next_rect.colliderect(ob.collision_rect):
-                off = (ob.collision_rect.left - next_rect.left, ob.collision_rect.top - next_rect.top)
-                if self.mask.overlap(ob.collision_mask, off):
+        # Broad phase: only obstacles sharing a grid cell; then opaque bounds, then mask
+        hit_rect = opaque_bounds(self.image).move(left, top)
+        hits, overlap = hit_rect.colliderect, self.mask.overlap
+        for ob in obstacle_grid.query_rect(hit_rect):
+            if hits(ob.opaque_rect):
+                cr = ob.collision_rect
+                if overlap(ob.collision_mask, (cr.left - left, cr.top - top)):
                     # Slide away gently
-                    push = (self.pos - Vector2(ob.collision_rect.center))
+                    push = (self.pos - ob.center_vec)
                     if push.length_squared() == 0:
                         push = Vector2(random.uniform(-1, 1), random.uniform(-1, 1))
                     push = push.normalize() * (self.cell_size * 0.06)
                     self.pos += push
                     self.vel *= 0.55
                     collided = True
-                    # invalidate path so A* recomputes next tick
+                    # invalidate path so it is searched again next tick
                     self.path = []
                     break
 
         if not collided:
-            self.pos = next_pos
+            self.pos.update(nx, ny)
 
         self.rect.center = (int(self.pos.x), int(self.pos.y))
-        self.update_animation()
+        self.update_animation(now_ms)
+
+
+def sort_by_depth(draw_order):
+    """Insertion-sorts sprites by pos.y in place; near linear since the order barely changes per frame"""
+    for i in range(1, len(draw_order)):
+        item = draw_order[i]
+        key = item.pos.y
+        j = i
+        while j > 0 and draw_order[j - 1].pos.y > key:
+            draw_order[j] = draw_order[j - 1]
+            j -= 1
+        draw_order[j] = item
+    return draw_order
+
+
+def unit_rows(rows):
+    """Normalizes each (x, y) row, leaving zero rows at zero"""
+    length = np.linalg.norm(rows, axis=1, keepdims=True)
+    return np.divide(rows, length, out=np.zeros_like(rows), where=length > 0)
+
+
+class SwarmState:
+    """Packed (N, 2) float32 enemy positions and velocities for one vectorized step per frame"""
+    def __init__(self, enemies):
+        self.enemies = enemies  # A list; rows line up with its indices, so don't resize it mid-frame
+        self.pos = np.array([(en.pos.x, en.pos.y) for en in self.enemies], dtype=np.float32).reshape(-1, 2)
+        self.vel = np.array([(en.vel.x, en.vel.y) for en in self.enemies], dtype=np.float32).reshape(-1, 2)
+        self.desired = np.zeros_like(self.vel)  # Raw directions from Enemy.steering
+
+    def step(self, dt, separation, avoid):
+        steer = (unit_rows(self.desired) * ENEMY_MAX_SPEED - self.vel
+                 + unit_rows(separation) * (SEPARATION_FORCE * dt)
+                 + unit_rows(avoid) * (ENEMY_AVOID_FORCE * dt))
+        # Clamp steering to the acceleration budget, then cap speed
+        max_change = ENEMY_ACCELERATION * dt
+        change = np.linalg.norm(steer, axis=1, keepdims=True)
+        steer *= np.minimum(1.0, max_change / np.maximum(change, 1e-6))
+        self.vel += steer
+        speed = np.linalg.norm(self.vel, axis=1, keepdims=True)
+        self.vel *= np.minimum(1.0, ENEMY_MAX_SPEED / np.maximum(speed, 1e-6))
+        self.pos += self.vel * dt
+
+
+def inverse_square_push(positions, sources, radius):
+    """Sums the inverse-square push away from every source row within radius, for every (x, y) row at once"""
+    diff = positions[:, None, :] - sources[None, :, :]
+    # einsum contracts in place of building the (N, M, 2) products for d2 and the weighted sum
+    d2 = np.einsum('ijk,ijk->ij', diff, diff)
+    near = (d2 > 0) & (d2 < radius * radius)
+    inv_d2 = np.divide(1.0, d2, out=np.zeros_like(d2), where=near)
+    return np.einsum('ij,ijk->ik', inv_d2, diff)
+
+def compute_separation(positions):
+    """Push away from close neighbours; a row never pushes itself since its d2 is 0"""
+    return inverse_square_push(positions, positions, SEPARATION_RADIUS)
+
+def compute_avoidance(positions, obstacle_centers):
+    """Push away from nearby obstacle centers, from the (M, 2) array built by obstacle_center_array"""
+    return inverse_square_push(positions, obstacle_centers, ENEMY_AVOID_RADIUS)
 
 
 # ------------------------------ placement utils ------------------------------
@@ -1241,26 +1810,26 @@ def place_obstacles(count, avoid_pos, min_dist, world_size, asset_pairs):
 
 def place_enemies(count, avoid_pos, min_dist, world_size, nav_grid, cell_size, enemy_anims_list):
     enemies = pygame.sprite.Group()
+    placed_pos = np.empty((count, 2), dtype=np.float32)
     attempts = 0
     placed = 0
     max_attempts = count * PLACEMENT_ATTEMPTS_MULT
+    ax, ay = avoid_pos
+    min_d2 = min_dist * min_dist
     while placed < count and attempts < max_attempts:
         attempts += 1
         x = random.randint(64, world_size[0] - 64)
         y = random.randint(64, world_size[1] - 64)
-        pos = Vector2(x, y)
-        if pos.distance_to(Vector2(avoid_pos)) < min_dist:
-            continue
-        too_close = False
-        for en in enemies:
-            if pos.distance_to(Vector2(en.rect.center)) < 70:
-                too_close = True
-                break
-        if too_close:
+        if (x - ax) * (x - ax) + (y - ay) * (y - ay) < min_d2:
             continue
+        if placed:
+            d2 = ((placed_pos[:placed] - (x, y)) ** 2).sum(axis=1)
+            if d2.min() < 70 * 70:
+                continue
         anims = random.choice(enemy_anims_list)
-        en = Enemy(pos, nav_grid, cell_size, anims, FRAME_DURATION)
+        en = Enemy(Vector2(x, y), nav_grid, cell_size, anims, FRAME_DURATION)
         enemies.add(en)
+        placed_pos[placed] = (x, y)
         placed += 1
     return enemies
 
@@ -1290,7 +1859,7 @@ def main():
                 return pygame.image.load(path).convert_alpha()
             except Exception as e:
                 print(f"Failed loading {path}: {e}")
-        surf = pygame.Surface(fallback_size, pygame.SRCALPHA)
+        surf = pygame.Surface(fallback_size, pygame.SRCALPHA).convert_alpha()
         surf.fill((180, 180, 180, 255))
         pygame.draw.rect(surf, (0, 0, 0), surf.get_rect(), 2)
         return surf
@@ -1305,10 +1874,12 @@ def main():
 
     player_start = (WORLD_SIZE[0] // 2, WORLD_SIZE[1] // 2)
     
-    player_day_anims = {state: {facing: frames[:] for facing, frames in dirs.items()} for state, dirs in player_anims.items()}
+    # Animation sets are shared, never mutated, so transitions just rebind player.anim
+    player_trans_anims = {**player_anims, **trans_anims}
     
-    player = Player(player_day_anims, player_start, frame_durations=FRAME_DURATION, audio_manager=audio)
+    player = Player(player_anims, player_start, frame_durations=FRAME_DURATION, audio_manager=audio)
     camera = Camera(SCREEN_SIZE, WORLD_SIZE)
+    apply_xy = camera.apply_xy
     shader = ShaderEffect(SCREEN_SIZE)
     ground = GroundRenderer(GROUND_TEXTURE, WORLD_SIZE)
 
@@ -1331,6 +1902,10 @@ def main():
     OBSTACLE_ASSET_PAIRS = [(tree_base, tree_top), (rock_base, rock_top),(box1_base,box1),(box2_base,box2),(mkst_base,mkst),(pray_base,pray_top)]
     obstacles = place_obstacles(OBSTACLE_COUNT, player_start, OBSTACLE_MIN_DIST, WORLD_SIZE, OBSTACLE_ASSET_PAIRS)
 
+    obstacle_grid = build_obstacle_grid(obstacles)
+    obstacle_centers = obstacle_center_array(obstacles)
+    top_grid = build_top_grid(obstacles)
+    ground.bake_obstacle_bases(obstacles)
     nav_grid = build_nav_grid(WORLD_SIZE, NAV_CELL_SIZE, obstacles, expand_cells=NAV_EXPAND_CELLS)
 
     enemy_anims_list = []
@@ -1341,15 +1916,18 @@ def main():
                 anims = build_animations_from_master(path, FRAME_WIDTH, FRAME_HEIGHT, ENEMY_SHEET_LAYOUT, scale=SHEET_SCALE)
                 enemy_anims_list.append(anims)
     if not enemy_anims_list:
-        surf = pygame.Surface((36, 36), pygame.SRCALPHA)
+        surf = pygame.Surface((36, 36), pygame.SRCALPHA).convert_alpha()
         pygame.draw.circle(surf, (160, 40, 40), (18, 18), 18)
         anims = {'idle': {}, 'run': {}}
         for d in ['down', 'left', 'right', 'up']:
             anims['idle'][d] = [surf]
             anims['run'][d] = [surf]
         enemy_anims_list.append(anims)
+    for anims in [player_anims, player_night_anims, trans_anims] + enemy_anims_list:
+        warm_masks(anims)
 
     enemies = place_enemies(ENEMY_COUNT, player_start, ENEMY_SPAWN_MIN_DIST, WORLD_SIZE, nav_grid, NAV_CELL_SIZE, enemy_anims_list)
+    enemy_draw_order = list(enemies)  # Kept sorted back-to-front across frames
 
     # heart UI
     heart_img = None
@@ -1359,7 +1937,7 @@ def main():
             scale = 24 / heart_img.get_height()
             heart_img = pygame.transform.scale(heart_img, (int(heart_img.get_width() * scale), 24))
     else:
-        heart_img = pygame.Surface((36, 36), pygame.SRCALPHA)
+        heart_img = pygame.Surface((36, 36), pygame.SRCALPHA).convert_alpha()
         pygame.draw.polygon(heart_img, (220, 50, 50), [(18, 4), (30, 12), (18, 32), (6, 12)])
         pygame.draw.circle(heart_img, (220, 50, 50), (11, 10), 6)
         pygame.draw.circle(heart_img, (220, 50, 50), (25, 10), 6)
@@ -1435,11 +2013,15 @@ def main():
                 mx, my = event.pos
                 if game_state == 'menu':
                     if start_btn.collidepoint(mx, my):
-                        player_fresh_anims = {state: {facing: frames[:] for facing, frames in dirs.items()} for state, dirs in player_anims.items()}
-                        player = Player(player_fresh_anims, player_start, frame_durations=FRAME_DURATION, audio_manager=audio)
+                        player = Player(player_anims, player_start, frame_durations=FRAME_DURATION, audio_manager=audio)
                         obstacles = place_obstacles(OBSTACLE_COUNT, player_start, OBSTACLE_MIN_DIST, WORLD_SIZE, OBSTACLE_ASSET_PAIRS)
+                        obstacle_grid = build_obstacle_grid(obstacles)
+                        obstacle_centers = obstacle_center_array(obstacles)
+                        top_grid = build_top_grid(obstacles)
+                        ground.bake_obstacle_bases(obstacles)
                         nav_grid = build_nav_grid(WORLD_SIZE, NAV_CELL_SIZE, obstacles, expand_cells=NAV_EXPAND_CELLS)
                         enemies = place_enemies(ENEMY_COUNT, player_start, ENEMY_SPAWN_MIN_DIST, WORLD_SIZE, nav_grid, NAV_CELL_SIZE, enemy_anims_list)
+                        enemy_draw_order = list(enemies)
                         day_timer = 0.0
                         is_night = False
                         night_phase = 'none'
@@ -1469,35 +2051,26 @@ def main():
             sky_color = get_sky_color(day_timer, DAY_LENGTH, NIGHT_LENGTH)
             screen.fill(sky_color)
             
-            # Draw ground texture
-            ground.draw(screen, camera.offset)
-            
-            # Draw obstacles
-            for ob in obstacles:
-                screen.blit(ob.base_image, camera.apply(ob.collision_rect).topleft)
+            # Draw ground texture (obstacle bases are baked into it)
+            ground.draw(screen, camera.view_offset)
             
             # Draw enemies
-            for en in sorted(enemies, key=lambda e: e.pos.y):
-                screen.blit(en.image, camera.apply(en.rect).topleft)
+            screen.blits([(en.image, apply_xy(en.rect)) for en in sort_by_depth(enemy_draw_order)], False)
             
             # Draw player
-            screen.blit(player.image, camera.apply(player.rect).topleft)
+            screen.blit(player.image, apply_xy(player.rect))
             
             # Draw top parts
-            for ob in obstacles:
-                if ob.top_image:
-                    screen.blit(ob.top_image, camera.apply(ob.top_rect).topleft)
+            screen.blits([(ob.top_image, apply_xy(ob.top_rect)) for ob in top_grid.query_rect(camera.view_rect())], False)
             
             # Draw darkening overlay
-            overlay = pygame.Surface(SCREEN_SIZE, pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 120))
-            screen.blit(overlay, (0, 0))
+            screen.blit(get_overlay(SCREEN_SIZE, (0, 0, 0, 120)), (0, 0))
             
             # Draw control hints
             draw_control_hints(screen, SCREEN_SIZE)
             
             # Update and draw cutscene
-            current_cutscene.update()
+            current_cutscene.update(now_ms)
             current_cutscene.draw(screen, SCREEN_SIZE)
             
             pygame.display.flip()
@@ -1508,41 +2081,26 @@ def main():
             sky_color = get_sky_color(day_timer, DAY_LENGTH, NIGHT_LENGTH)
             screen.fill(sky_color)
             
-            # Draw ground texture
-            ground.draw(screen, camera.offset)
-            
-            # Draw obstacles
-            for ob in obstacles:
-                screen.blit(ob.base_image, camera.apply(ob.collision_rect).topleft)
+            # Draw ground texture (obstacle bases are baked into it)
+            ground.draw(screen, camera.view_offset)
             
             # Draw enemies
-            for en in sorted(enemies, key=lambda e: e.pos.y):
-                screen.blit(en.image, camera.apply(en.rect).topleft)
+            screen.blits([(en.image, apply_xy(en.rect)) for en in sort_by_depth(enemy_draw_order)], False)
             
             # Draw player (in transition)
-            screen.blit(player.image, camera.apply(player.rect).topleft)
+            screen.blit(player.image, apply_xy(player.rect))
             
             # Draw top parts
-            for ob in obstacles:
-                if ob.top_image:
-                    screen.blit(ob.top_image, camera.apply(ob.top_rect).topleft)
+            screen.blits([(ob.top_image, apply_xy(ob.top_rect)) for ob in top_grid.query_rect(camera.view_rect())], False)
             
             # Night darkness
-            dark = pygame.Surface(SCREEN_SIZE, pygame.SRCALPHA)
-            dark.fill((0, 0, 0, DARK_ALPHA))
-            screen.blit(dark, (0, 0))
+            screen.blit(get_overlay(SCREEN_SIZE, (0, 0, 0, DARK_ALPHA)), (0, 0))
             
             # Sky gradient
-            gradient_height = 60
-            gradient_surf = pygame.Surface((SCREEN_SIZE[0], gradient_height), pygame.SRCALPHA)
-            for y in range(gradient_height):
-                alpha = int(255 * (1 - y / gradient_height) * 0.7)
-                color = sky_color + (alpha,)
-                pygame.draw.line(gradient_surf, color, (0, y), (SCREEN_SIZE[0], y))
-            screen.blit(gradient_surf, (0, 0))
+            screen.blit(get_sky_gradient(sky_color, SCREEN_SIZE[0]), (0, 0))
             
             # Update and draw cutscene
-            current_cutscene.update()
+            current_cutscene.update(now_ms)
             current_cutscene.draw(screen, SCREEN_SIZE)
             
             pygame.display.flip()
@@ -1569,12 +2127,10 @@ def main():
                     night_cutscene_shown = True
                     
                     # Prepare transition animations
-                    player.anim = {state: {facing: frames[:] for facing, frames in dirs.items()} for state, dirs in player_anims.items()}
-                    for state in trans_anims:
-                        player.anim[state] = trans_anims[state]
+                    player.anim = player_trans_anims
                     
                     # Start transition animation
-                    player.play_transition_animation()
+                    player.play_transition_animation(now_ms)
                     
                     # Halt enemies during cutscene
                     for en in enemies:
@@ -1586,11 +2142,9 @@ def main():
                     continue  # Skip the rest of this frame
                 else:
                     # Subsequent night transitions (no cutscene)
-                    player.anim = {state: {facing: frames[:] for facing, frames in dirs.items()} for state, dirs in player_anims.items()}
-                    for state in trans_anims:
-                        player.anim[state] = trans_anims[state]
+                    player.anim = player_trans_anims
                     
-                    player.play_transition_animation()
+                    player.play_transition_animation(now_ms)
                     
                     night_phase = 'idle_halt'
                     night_phase_timer = TRANSITION_MS / 1000.0
@@ -1610,140 +2164,130 @@ def main():
                         # ensure player's frame/state resets so run works
                         player.stop_night_animation()
                         player.frame_idx = 0
-                        player.last_frame_time = pygame.time.get_ticks()
                         player.pause_until = 0
                         night_phase = 'flee'
                         for en in enemies:
                             en.mode = 'flee'
-                            en.last_recalc = -9999.0
+                            en.next_recalc = -math.inf
                 elif night_phase == 'flee':
                     # enemies flee; nothing else forced on player
                     pass
             else:
                 # day resumed: ensure player uses day animations and enemies chase
                 if night_phase != 'none':
-                    # Create a fresh copy of day animations (without transition state)
-                    player.anim = {state: {facing: frames[:] for facing, frames in dirs.items()} for state, dirs in player_anims.items()}
+                    # Back to the day animations (without transition state)
+                    player.anim = player_anims
                     player.stop_night_animation()
                     player.frame_idx = 0
-                    player.last_frame_time = pygame.time.get_ticks()
                     night_phase = 'none'
                     for en in enemies:
                         en.mode = 'chase'
-                        en.last_recalc = -9999.0
+                        en.next_recalc = -math.inf
                     
                     # Resume day music
                     audio.play_music(MUSIC_DAY, MUSIC_VOLUME['day'], loops=-1)
 
             # Update player
-            player.update(dt, keys, allow_control=True)
-
-            # Player vs obstacles collision (rect then mask)
-            for ob in obstacles:
-                if player.rect.colliderect(ob.collision_rect):
-                    offset = (ob.collision_rect.left - player.rect.left, ob.collision_rect.top - player.rect.top)
-                    if player.mask.overlap(ob.collision_mask, offset):
-                        if player.collide_with_obstacle(ob) and SHAKE_ON_OBSTACLE:
-                            camera.shake()
+            player.update(dt, keys, now_ms, allow_control=True)
+
+            # Player vs obstacles collision (grid cells, then opaque bounds, then mask)
+            player_left, player_top = player.rect.topleft
+            player_hit_rect = opaque_bounds(player.image).move(player_left, player_top)
+            hits_player, player_overlap = player_hit_rect.colliderect, player.mask.overlap
+            for ob in obstacle_grid.query_rect(player_hit_rect):
+                if hits_player(ob.opaque_rect):
+                    cr = ob.collision_rect
+                    if player_overlap(ob.collision_mask, (cr.left - player_left, cr.top - player_top)):
+                        if player.collide_with_obstacle(ob, now_ms) and SHAKE_ON_OBSTACLE:
+                            camera.shake(now_ms)
                         break
 
             # Update enemies
-            now_sec = pygame.time.get_ticks() / 1000.0
-            for en in list(enemies):
+            now_sec = now_ms / 1000.0
+            player_cell = world_to_cell(player.pos, NAV_CELL_SIZE)
+            swarm = SwarmState(enemy_draw_order)
+            separation = compute_separation(swarm.pos)
+            avoid = compute_avoidance(swarm.pos, obstacle_centers)
+            moving = []
+            despawned = []
+            desired_rows = swarm.desired
+            for i, en in enumerate(swarm.enemies):
                 # handle hit/despawn and award heart on actual removal
                 if en.hit:
-                    if pygame.time.get_ticks() - en.hit_time >= ENEMY_DESPAWN_MS:
+                    if now_ms - en.hit_time >= ENEMY_DESPAWN_MS:
                         player.hearts = min(99, player.hearts + 1)
                         player.gain_heart()  # Play heal sound
-                        enemies.remove(en)
+                        despawned.append(en)
                         # Play rip sound when enemy despawns
                         audio.play_sound('rip')
                     continue
                 if en.mode == 'halt':
                     continue
-                en.update(dt, player, obstacles, enemies, now_sec)
-
-            # Enemy-player collision
-            for en in list(enemies):
-                # Skip collision check if enemy is already hit (being eaten)
-                if en.hit:
-                    continue
-                    
-                if en.rect.colliderect(player.rect):
-                    offset = (en.rect.left - player.rect.left, en.rect.top - player.rect.top)
-                    if player.mask.overlap(en.mask, offset):
+                desired = en.steering(player, player_cell, now_sec)
+                desired_rows[i] = (desired.x, desired.y)
+                moving.append(i)
+            swarm.step(dt, separation, avoid)
+            swarm_enemies, vel_rows, pos_rows = swarm.enemies, swarm.vel, swarm.pos
+            for i in moving:
+                swarm_enemies[i].move(vel_rows[i], pos_rows[i], obstacle_grid, now_ms)
+            for en in despawned:
+                enemies.remove(en)
+                enemy_draw_order.remove(en)
+
+            # Enemy-player collision; enemies already hit (being eaten) aren't in the grid
+            player_left, player_top = player.rect.topleft
+            player_overlap = player.mask.overlap
+            enemy_grid = build_enemy_grid(enemies)
+            for en in enemy_grid.query_rect(player_hit_rect):
+                en_left, en_top = en.rect.topleft
+                if hits_player(opaque_bounds(en.image).move(en_left, en_top)):
+                    if player_overlap(en.mask, (en_left - player_left, en_top - player_top)):
                         if is_night and night_phase == 'flee':
                             # catch fleeing enemy: mark it hit (will despawn after ENEMY_DESPAWN_MS)
-                            player.pause_until = pygame.time.get_ticks() + PLAYER_PAUSE_ON_CATCH_MS
+                            player.pause_until = now_ms + PLAYER_PAUSE_ON_CATCH_MS
                             en.hit = True
-                            en.hit_time = pygame.time.get_ticks()
+                            en.hit_time = now_ms
                         else:
                             # daytime hit: lose a heart and get knocked back
                             player.hearts = max(0, player.hearts - 1)
-                            if player.hit_by_enemy(en) and SHAKE_ON_HIT:
-                                camera.shake()
+                            if player.hit_by_enemy(en, now_ms) and SHAKE_ON_HIT:
+                                camera.shake(now_ms)
                             en.vel *= -0.3
                         break
 
-            camera.update(player.rect, player.vel)
+            camera.update(player.rect, now_ms, player.vel)
 
             sky_color = get_sky_color(day_timer, DAY_LENGTH, NIGHT_LENGTH)
 
             screen.fill(sky_color)  # Fill with sky color as background
             
-            ground.draw(screen, camera.offset)
+            ground.draw(screen, camera.view_offset)  # Includes the baked obstacle bases
 
-            for ob in obstacles:
-                screen.blit(ob.base_image, camera.apply(ob.collision_rect).topleft)
+            screen.blits([(tinted(en.image, (255, 0, 0, 140)) if en.hit else en.image, apply_xy(en.rect))
+                          for en in sort_by_depth(enemy_draw_order)], False)
 
-            for en in sorted(enemies, key=lambda e: e.pos.y):
-                img = en.image.copy()
-                if en.hit:
-                    overlay = pygame.Surface(img.get_size(), pygame.SRCALPHA)
-                    overlay.fill((255, 0, 0, 140))
-                    img.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
-                screen.blit(img, camera.apply(en.rect).topleft)
-
-            player_draw_img = player.image.copy()
-            if pygame.time.get_ticks() < player.flash_until:
-                overlay = pygame.Surface(player_draw_img.get_size(), pygame.SRCALPHA)
-                overlay.fill((255, 0, 0, 100))
-                player_draw_img.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
-            screen.blit(player_draw_img, camera.apply(player.rect).topleft)
-
-            for ob in obstacles:
-                if ob.top_image:
-                    screen.blit(ob.top_image, camera.apply(ob.top_rect).topleft)
+            player_draw_img = tinted(player.image, (255, 0, 0, 100)) if now_ms < player.flash_until else player.image
+            screen.blit(player_draw_img, apply_xy(player.rect))
+
+            screen.blits([(ob.top_image, apply_xy(ob.top_rect)) for ob in top_grid.query_rect(camera.view_rect())], False)
 
             if is_night:
-                dark = pygame.Surface(SCREEN_SIZE, pygame.SRCALPHA)
-                dark.fill((0, 0, 0, DARK_ALPHA))
-                screen.blit(dark, (0, 0))
-
-            gradient_height = 60
-            gradient_surf = pygame.Surface((SCREEN_SIZE[0], gradient_height), pygame.SRCALPHA)
-            for y in range(gradient_height):
-                alpha = int(255 * (1 - y / gradient_height) * 0.7)  # Fade out towards bottom
-                color = sky_color + (alpha,)
-                pygame.draw.line(gradient_surf, color, (0, y), (SCREEN_SIZE[0], y))
-            screen.blit(gradient_surf, (0, 0))
+                screen.blit(get_overlay(SCREEN_SIZE, (0, 0, 0, DARK_ALPHA)), (0, 0))
+
+            screen.blit(get_sky_gradient(sky_color, SCREEN_SIZE[0]), (0, 0))
 
             padding = 8
-            for i in range(player.hearts):
-                x = padding + i * (heart_img.get_width() + 4)
-                y = padding
-                screen.blit(heart_img, (x, y))
+            if player.hearts > 0:
+                screen.blit(get_heart_row(heart_img, player.hearts), (padding, padding))
 
             bar_w = 160
             bar_h = 14
             bar_x = SCREEN_SIZE[0] - bar_w - 12
             bar_y = 12
-            pygame.draw.rect(screen, (40, 40, 40), (bar_x, bar_y, bar_w, bar_h))
             perc = player.stamina / STAMINA_MAX
             inner_w = int(bar_w * perc)
-            pygame.draw.rect(screen, (80, 200, 120), (bar_x + 2, bar_y + 2, max(0, inner_w - 4), bar_h - 4))
-            stext = font.render("Stamina", True, (255, 255, 255))
-            screen.blit(stext, (bar_x - 86, bar_y - 2))
+            screen.blit(get_stamina_bar(bar_w, bar_h, inner_w), (bar_x, bar_y))
+            screen.blit(cached_render(font, "Stamina", (255, 255, 255)), (bar_x - 86, bar_y - 2))
             
             shader.apply_effects(screen)
 